@@ -11,18 +11,35 @@ MacSSH Release Automation Script
 
 import os
 import sys
+import hashlib
+from html import escape
 import subprocess
 import re
 import time
 import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from pathlib import Path
 
+# Шаблоны версий в project.pbxproj (компилируются один раз при импорте)
+_MARKETING_RE = re.compile(r'MARKETING_VERSION = ([^;]+);')
+_BUILD_RE = re.compile(r'CURRENT_PROJECT_VERSION = ([^;]+);')
+# CFBundleVersion в Info.plist: ключ и значение могут разделяться любыми пробелами
+_BUNDLE_VERSION_RE = re.compile(r'(<key>CFBundleVersion</key>\s*<string>)[^<]*(</string>)')
+
 class MacSSHReleaseAutomation:
-    def __init__(self):
+    def __init__(self, clean_build=False, assume_yes=False):
         self.project_root = Path.cwd()
         self.xcode_project = self.project_root / "MacSSH.xcodeproj" / "project.pbxproj"
         self.info_plist = self.project_root / "MacSSH" / "Info.plist"
         self.appcast_xml = self.project_root / "appcast.xml"
+        # Кэш сгенерированных appcast.xml для повторных запусков релиза
+        self.cache_dir = Path.home() / ".cache" / "macssh-release"
+        # Полная пересборка (clean) вместо инкрементальной
+        self.clean_build = clean_build
+        # Автоматически отвечать «да» на все подтверждения (запуск без участия человека)
+        self.assume_yes = assume_yes
         
         # Текущие версии
         self.current_version = None
@@ -32,6 +49,10 @@ class MacSSHReleaseAutomation:
         # Текст заметок релиза (plain) и HTML-список для appcast
         self.release_notes_text = None
         self.release_notes_html = None
+        # Содержимое project.pbxproj, прочитанное в get_current_versions
+        self.pbxproj_content = None
+        # SHA-256 созданного DMG (вычисляется один раз)
+        self.dmg_sha256 = None
         
     def log(self, message, level="INFO"):
         """Логирование с временными метками"""
@@ -39,12 +60,16 @@ class MacSSHReleaseAutomation:
         print(f"[{timestamp}] {level}: {message}")
     
     def run_command(self, command, check=True, capture_output=True):
-        """Выполнение команды с обработкой ошибок"""
-        self.log(f"Выполняю: {command}")
+        """Выполнение команды с обработкой ошибок.
+        command — список аргументов (запуск напрямую, без shell)
+        или строка (запуск через shell, нужен для конвейеров)
+        """
+        use_shell = isinstance(command, str)
+        self.log(f"Выполняю: {command if use_shell else ' '.join(command)}")
         try:
             result = subprocess.run(
                 command, 
-                shell=True, 
+                shell=use_shell, 
                 check=check, 
                 capture_output=capture_output,
                 text=True,
@@ -60,17 +85,33 @@ class MacSSHReleaseAutomation:
             if not check:
                 return e
             sys.exit(1)
+        except FileNotFoundError as e:
+            # Без shell отсутствующая программа не дает код 127, а бросает исключение
+            self.log(f"Команда не найдена: {e.filename}", "ERROR")
+            if not check:
+                return None
+            sys.exit(1)
+    
+    def check_required_tools(self):
+        """Проверка наличия всех внешних утилит до любых изменений"""
+        self.log("Проверяю необходимые утилиты...")
+        
+        missing = [tool for tool in ("xcodebuild", "create-dmg", "gh", "git") if shutil.which(tool) is None]
+        if missing:
+            self.log(f"Не найдены утилиты: {', '.join(missing)}", "ERROR")
+            self.log("Установите их (см. --help) и запустите скрипт снова", "ERROR")
+            sys.exit(1)
     
     def get_current_versions(self):
         """Получение текущих версий из project.pbxproj"""
         self.log("Получаю текущие версии...")
         
         # Читаем project.pbxproj
-        with open(self.xcode_project, 'r') as f:
-            content = f.read()
+        content = self.xcode_project.read_text(encoding="utf-8")
+        self.pbxproj_content = content
         
         # Ищем MARKETING_VERSION
-        version_match = re.search(r'MARKETING_VERSION = ([^;]+);', content)
+        version_match = _MARKETING_RE.search(content)
         if not version_match:
             self.log("Не найден MARKETING_VERSION в project.pbxproj", "ERROR")
             sys.exit(1)
@@ -78,7 +119,7 @@ class MacSSHReleaseAutomation:
         self.current_version = version_match.group(1).strip()
         
         # Ищем CURRENT_PROJECT_VERSION
-        build_match = re.search(r'CURRENT_PROJECT_VERSION = ([^;]+);', content)
+        build_match = _BUILD_RE.search(content)
         if not build_match:
             self.log("Не найден CURRENT_PROJECT_VERSION в project.pbxproj", "ERROR")
             sys.exit(1)
@@ -104,56 +145,67 @@ class MacSSHReleaseAutomation:
         
         self.log(f"Новая версия: {self.new_version} (build {self.new_build})")
     
-    def update_project_pbxproj(self):
-        """Обновление версий в project.pbxproj"""
-        self.log("Обновляю project.pbxproj...")
-        
-        with open(self.xcode_project, 'r') as f:
-            content = f.read()
-        
-        # Заменяем версии
-        content = re.sub(
+    def write_file_atomic(self, path, content):
+        """Атомарная запись файла: временный файл + переименование"""
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_text(content, encoding="utf-8")
+        os.replace(tmp_path, path)
+    
+    def update_version_files(self):
+        """Обновление версий в project.pbxproj и Info.plist"""
+        self.log("Обновляю project.pbxproj и Info.plist...")
+        
+        # project.pbxproj уже прочитан при получении текущих версий
+        pbxproj = self.pbxproj_content
+        if pbxproj is None:
+            pbxproj = self.xcode_project.read_text(encoding="utf-8")
+        plist = self.info_plist.read_text(encoding="utf-8")
+        
+        # Заменяем версии в project.pbxproj
+        # (литеральная замена: точки в версии не являются шаблоном)
+        pbxproj = pbxproj.replace(
             f'MARKETING_VERSION = {self.current_version};',
-            f'MARKETING_VERSION = {self.new_version};',
-            content
-        )
-        
-        content = re.sub(
+            f'MARKETING_VERSION = {self.new_version};'
+        ).replace(
             f'CURRENT_PROJECT_VERSION = {self.current_build};',
-            f'CURRENT_PROJECT_VERSION = {self.new_build};',
-            content
+            f'CURRENT_PROJECT_VERSION = {self.new_build};'
         )
         
-        with open(self.xcode_project, 'w') as f:
-            f.write(content)
-        
-        self.log("project.pbxproj обновлен")
-    
-    def update_info_plist(self):
-        """Обновление версии в Info.plist"""
-        self.log("Обновляю Info.plist...")
-        
-        with open(self.info_plist, 'r') as f:
-            content = f.read()
-        
         # Заменяем CFBundleShortVersionString
-        content = re.sub(
+        plist = plist.replace(
             f'<string>{self.current_version}</string>',
-            f'<string>{self.new_version}</string>',
-            content
+            f'<string>{self.new_version}</string>'
         )
         
-        # Заменяем CFBundleVersion
-        content = re.sub(
-            f'<key>CFBundleVersion</key>\\s*<string>{self.current_build}</string>',
-            f'<key>CFBundleVersion</key>\\n\\t<string>{self.new_build}</string>',
-            content
+        # Заменяем CFBundleVersion, сохраняя исходные отступы
+        plist = _BUNDLE_VERSION_RE.sub(
+            lambda m: f'{m.group(1)}{self.new_build}{m.group(2)}',
+            plist
         )
         
-        with open(self.info_plist, 'w') as f:
-            f.write(content)
+        # Записываем оба файла только после успешной подготовки содержимого
+        self.write_file_atomic(self.xcode_project, pbxproj)
+        self.write_file_atomic(self.info_plist, plist)
+        self.pbxproj_content = None
         
-        self.log("Info.plist обновлен")
+        self.log("project.pbxproj и Info.plist обновлены")
+    
+    def get_dmg_sha256(self, dmg_name):
+        """SHA-256 DMG файла, читается блоками и запоминается"""
+        if self.dmg_sha256 is None:
+            digest = hashlib.sha256()
+            with open(dmg_name, 'rb') as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                    digest.update(chunk)
+            self.dmg_sha256 = digest.hexdigest()
+        return self.dmg_sha256
+    
+    def write_dmg_checksum(self, dmg_name):
+        """Запись контрольной суммы DMG в формате shasum -a 256"""
+        checksum_name = f"{dmg_name}.sha256"
+        Path(checksum_name).write_text(f"{self.get_dmg_sha256(dmg_name)}  {dmg_name}\n", encoding="utf-8")
+        self.log(f"Контрольная сумма записана: {checksum_name}")
+        return checksum_name
     
     def update_appcast_xml(self):
         """Обновление appcast.xml"""
@@ -166,17 +218,26 @@ class MacSSHReleaseAutomation:
             self.log(f"❌ Error: DMG файл {dmg_name} не найден", "ERROR")
             return
         
+        # Готовим содержимое заметок: если не заполнено, используем заглушку
+        notes_html = self.release_notes_html or "<ul><li>No release notes provided</li></ul>"
+        
+        # При повторном запуске с тем же DMG и заметками используем готовый appcast
+        notes_sha8 = hashlib.sha256(notes_html.encode("utf-8")).hexdigest()[:8]
+        dmg_sha8 = self.get_dmg_sha256(dmg_name)[:8]
+        cached_appcast = self.cache_dir / f"{self.new_version}-{self.new_build}-{dmg_sha8}-{notes_sha8}.xml"
+        if cached_appcast.exists():
+            shutil.copyfile(cached_appcast, self.appcast_xml)
+            self.log(f"appcast.xml взят из кэша: {cached_appcast}")
+            return
+        
         # Получаем размер DMG файла
         dmg_size = os.path.getsize(dmg_name)
         
         # Получаем текущую дату
-        from datetime import datetime
-        current_date = datetime.utcnow().strftime("%a, %d %b %Y %H:%M:%S +0000")
+        current_date = datetime.now(timezone.utc).strftime("%a, %d %b %Y %H:%M:%S +0000")
         
         tag = f"v{self.new_version}"
         
-        # Готовим содержимое заметок: если не заполнено, используем заглушку
-        notes_html = self.release_notes_html or "<ul><li>No release notes provided</li></ul>"
         # Создаем новый элемент для appcast.xml
         new_item = f'''        <item>
             <title>MacSSH {self.new_version} - Release</title>
@@ -207,15 +268,18 @@ class MacSSHReleaseAutomation:
 </rss>'''
         
         # Записываем новый файл
-        with open("appcast.xml", "w", encoding="utf-8") as f:
-            f.write(appcast_content)
+        self.appcast_xml.write_text(appcast_content, encoding="utf-8")
+        
+        # Сохраняем в кэш для повторных запусков
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(self.appcast_xml, cached_appcast)
         
         self.log("appcast.xml обновлен")
 
     def get_last_release_tag(self):
         """Определение последнего релизного тега (v*)"""
         # Пытаемся получить ближайший тег
-        result = self.run_command("git describe --tags --abbrev=0", check=False, capture_output=True)
+        result = self.run_command(["git", "describe", "--tags", "--abbrev=0"], check=False, capture_output=True)
         if result and result.returncode == 0 and result.stdout.strip():
             tag = result.stdout.strip()
             self.log(f"Последний тег: {tag}")
@@ -231,17 +295,22 @@ class MacSSHReleaseAutomation:
 
     def get_commit_messages_since(self, last_tag):
         """Сбор сообщений коммитов с момента последнего тега до HEAD"""
+        # -z разделяет сообщения символом NUL
         if last_tag:
-            cmd = f"git log {last_tag}..HEAD --no-merges --pretty=format:%s"
+            # Ограничиваем объем на случай долгоживущей ветки
+            cmd = ["git", "log", f"{last_tag}..HEAD", "--no-merges", "-z", "--pretty=format:%s",
+                   "--max-count=200"]
         else:
             # Если нет тега — берём последние 20 коммитов
-            cmd = "git log --no-merges --pretty=format:%s -n 20"
+            cmd = ["git", "log", "--no-merges", "-z", "--pretty=format:%s", "--max-count=20"]
         result = self.run_command(cmd, check=False, capture_output=True)
         if result and result.returncode == 0 and result.stdout.strip():
-            messages = [line.strip() for line in result.stdout.splitlines() if line.strip()]
+            messages = [msg.strip() for msg in result.stdout.split("\x00") if msg.strip()]
             # По возможности убираем автокоммит версии из заметок
             if self.new_version:
                 messages = [m for m in messages if f"Update version to {self.new_version}" not in m]
+            # Коммит appcast.xml прошлого релиза попадает после его тега
+            messages = [m for m in messages if not m.startswith("Update appcast for ")]
             return messages
         return []
 
@@ -249,14 +318,15 @@ class MacSSHReleaseAutomation:
         """Преобразование списка строк заметок в HTML-список"""
         if not lines:
             return "<ul><li>No changes listed</li></ul>"
-        items = "\n".join([f"<li>{line}</li>" for line in lines])
+        # Экранируем < и &, чтобы темы коммитов не ломали HTML заметок
+        items = "\n".join(f"<li>{escape(line)}</li>" for line in lines)
         return f"<ul>\n{items}\n</ul>"
 
     def prompt_release_notes(self):
         """Интерактивное получение/подтверждение заметок релиза.
         1) Пытается сгенерировать заметки из git log от последнего тега
         2) Показывает предпросмотр и спрашивает подтверждение
-        3) Дает возможность ввести свои заметки (многострочно), разделяя пункты по строкам
+        3) Дает возможность вставить свои заметки (многострочно, до Ctrl-D), разделяя пункты по строкам
         """
         last_tag = self.get_last_release_tag()
         commits = self.get_commit_messages_since(last_tag)
@@ -264,22 +334,22 @@ class MacSSHReleaseAutomation:
             print("\n📝 Предварительные заметки релиза (из коммитов):")
             for msg in commits:
                 print(f" - {msg}")
-            use_auto = input("\nИспользовать эти заметки? (Y/n): ").strip().lower()
+            if self.assume_yes:
+                use_auto = "y"
+            else:
+                use_auto = input("\nИспользовать эти заметки? (Y/n): ").strip().lower()
             if use_auto in ("", "y", "yes"): 
                 self.release_notes_text = "\n".join(commits)
                 self.release_notes_html = self.format_release_notes_as_html(commits)
                 return
+        if self.assume_yes:
+            # Без участия человека ручной ввод невозможен — оставляем заглушку
+            self.log("Коммиты для заметок не найдены, заметки релиза будут пустыми", "WARNING")
+            return
         # Ручной ввод
-        print("\nВведите заметки релиза. Каждый пункт — с новой строки. Пустая строка завершит ввод:")
-        lines = []
-        while True:
-            try:
-                line = input()
-            except EOFError:
-                break
-            if line.strip() == "":
-                break
-            lines.append(line.strip())
+        print("\nВставьте заметки релиза. Каждый пункт — с новой строки. Завершите ввод Ctrl-D:")
+        # Читаем весь блок целиком, пустые строки пропускаем
+        lines = [line.strip() for line in sys.stdin.read().splitlines() if line.strip()]
         if not lines:
             # Последний фолбэк — используем то, что собрали (может быть пусто)
             lines = commits
@@ -291,51 +361,83 @@ class MacSSHReleaseAutomation:
         self.log("Начинаю локальную сборку...")
         print("🔄 Сборка в процессе... (это может занять несколько минут)")
         
-        # Очистка и сборка с подавлением вывода
-        result = self.run_command(
-            "xcodebuild -project MacSSH.xcodeproj -scheme MacSSH -configuration Release clean build",
-            capture_output=True
-        )
+        # Параллельная компиляция на всех ядрах
+        jobs = os.cpu_count() or 1
+        # По умолчанию инкрементальная сборка: кэш DerivedData переиспользуется,
+        # изменение версий затрагивает только обработку Info.plist
+        actions = ["clean", "build"] if self.clean_build else ["build"]
+        
+        command = ["xcodebuild", "-quiet", "-project", "MacSSH.xcodeproj", "-scheme", "MacSSH",
+                   "-configuration", "Release", "-jobs", str(jobs), "-parallelizeTargets",
+                   f"IDEBuildOperationMaxNumberOfConcurrentCompileTasks={jobs}", *actions]
+        
+        # Полный лог сборки пишем в файл, а не держим в памяти
+        build_log = Path("/tmp/macssh-build.log")
+        self.log(f"Выполняю: {' '.join(command)}")
+        self.log(f"Лог сборки: {build_log}")
+        with open(build_log, "w", encoding="utf-8") as log_file:
+            result = subprocess.run(
+                command,
+                stdout=log_file,
+                stderr=subprocess.STDOUT,
+                cwd=self.project_root
+            )
         
         if result.returncode == 0:
             self.log("✅ Локальная сборка завершена успешно")
         else:
             self.log("❌ Ошибка сборки", "ERROR")
-            self.log(f"Ошибка: {result.stderr}", "ERROR")
+            # Показываем только конец лога
+            print(build_log.read_text(encoding="utf-8", errors="replace")[-8192:])
             sys.exit(1)
     
+    def find_app_bundle(self):
+        """Поиск MacSSH.app в DerivedData за один проход.
+        Возвращает первую найденную Release-сборку, иначе любую найденную версию
+        """
+        derived_data = Path.home() / "Library" / "Developer" / "Xcode" / "DerivedData"
+        if not derived_data.is_dir():
+            return None
+        
+        # Каталоги, в которых собранного приложения быть не может
+        skip_dirs = {"Index", "Index.noindex", "Intermediates.noindex", "Logs",
+                     "ModuleCache.noindex", "SourcePackages"}
+        
+        # Сначала проверяем самые свежие сборки
+        projects = sorted(
+            (p for p in derived_data.iterdir() if p.is_dir()),
+            key=lambda p: p.stat().st_mtime,
+            reverse=True
+        )
+        
+        fallback = None
+        for project in projects:
+            for root, dirs, _ in os.walk(project):
+                if "MacSSH.app" in dirs:
+                    app_path = Path(root) / "MacSSH.app"
+                    if "Release" in app_path.relative_to(derived_data).parts:
+                        return app_path
+                    if fallback is None:
+                        fallback = app_path
+                # Не заходим внутрь бандлов и служебных каталогов
+                dirs[:] = [d for d in dirs if d not in skip_dirs and not d.endswith(".app")]
+        
+        if fallback is not None:
+            self.log("Release версия не найдена, используется любая найденная версия", "WARNING")
+        return fallback
+    
     def create_dmg(self):
         """Создание DMG файла"""
         self.log("Создаю DMG файл...")
         
         dmg_name = f"MacSSH-{self.new_version}.dmg"
         
-        # Находим путь к собранному приложению в Release конфигурации
-        result = self.run_command(
-            "find ~/Library/Developer/Xcode/DerivedData -name 'MacSSH.app' -path '*/Release/*' -type d | head -1",
-            capture_output=True
-        )
-        
-        if not result.stdout.strip():
-            # Пробуем найти в Products/Release
-            result = self.run_command(
-                "find ~/Library/Developer/Xcode/DerivedData -name 'MacSSH.app' -path '*/Products/Release/*' -type d | head -1",
-                capture_output=True
-            )
-            
-        if not result.stdout.strip():
-            self.log("Release версия не найдена, ищем любую версию...", "WARNING")
-            # Fallback: ищем любую версию
-            result = self.run_command(
-                "find ~/Library/Developer/Xcode/DerivedData -name 'MacSSH.app' -type d | head -1",
-                capture_output=True
-            )
-            
-            if not result.stdout.strip():
-                self.log("Не найден MacSSH.app после сборки", "ERROR")
-                sys.exit(1)
+        # Находим путь к собранному приложению (предпочтительно Release)
+        app_path = self.find_app_bundle()
+        if app_path is None:
+            self.log("Не найден MacSSH.app после сборки", "ERROR")
+            sys.exit(1)
         
-        app_path = Path(result.stdout.strip())
         self.log(f"Найдено приложение: {app_path}")
         
         # Создаем временную папку только с приложением
@@ -347,14 +449,21 @@ class MacSSHReleaseAutomation:
         
         temp_dir.mkdir(exist_ok=True)
         
-        # Копируем только приложение
-        shutil.copytree(app_path, temp_dir / "MacSSH.app")
+        # Копируем только приложение: на APFS cp -c создает клон без копирования данных
+        staged_app = temp_dir / "MacSSH.app"
+        result = self.run_command(["cp", "-cR", str(app_path), str(staged_app)], check=False)
+        if not result or result.returncode != 0:
+            self.log("APFS-клонирование недоступно, копирую приложение целиком", "WARNING")
+            if staged_app.exists():
+                shutil.rmtree(staged_app)
+            shutil.copytree(app_path, staged_app)
         
         # Создаем DMG только с приложением
         self.run_command(
-            f"create-dmg --volname 'MacSSH Installer' --window-pos 200 120 --window-size 800 400 "
-            f"--icon-size 100 --icon 'MacSSH.app' 200 190 --hide-extension 'MacSSH.app' "
-            f"--app-drop-link 600 185 '{dmg_name}' '{temp_dir}'"
+            ["create-dmg", "--volname", "MacSSH Installer", "--window-pos", "200", "120",
+             "--window-size", "800", "400", "--icon-size", "100", "--icon", "MacSSH.app", "200", "190",
+             "--hide-extension", "MacSSH.app", "--app-drop-link", "600", "185",
+             dmg_name, str(temp_dir)]
         )
         
         # Очищаем временную папку
@@ -363,48 +472,58 @@ class MacSSHReleaseAutomation:
         self.log(f"DMG файл создан: {dmg_name}")
         return dmg_name
     
-    def commit_and_push(self):
+    def commit_and_push(self, paths, message):
         """Коммит и отправка изменений"""
         self.log("Коммичу и отправляю изменения...")
         
         # Добавляем файлы
-        self.run_command("git add MacSSH.xcodeproj/project.pbxproj MacSSH/Info.plist appcast.xml")
+        self.run_command(["git", "add", *paths])
         
         # Коммит
-        self.run_command(f'git commit -m "Update version to {self.new_version} for release"')
+        self.run_command(["git", "commit", "-m", message])
         
         # Отправка
-        self.run_command("git push origin main")
+        self.run_command(["git", "push", "origin", "main"])
         
         self.log("Изменения отправлены")
     
-    def create_github_release(self):
-        """Создание GitHub Release"""
-        self.log("Создаю GitHub Release...")
-        
-        # Создаем релиз
-        self.run_command(
-            f'gh release create v{self.new_version} '
-            f'--title "MacSSH {self.new_version}" '
-            f'--notes "Release {self.new_version} (build {self.new_build})"'
-        )
-        
-        self.log(f"GitHub Release v{self.new_version} создан")
+    def get_head_commit(self):
+        """SHA текущего коммита HEAD"""
+        result = self.run_command(["git", "rev-parse", "HEAD"])
+        return result.stdout.strip()
     
-    def upload_dmg_to_release(self):
-        """Загрузка DMG в GitHub Release"""
-        self.log("Загружаю DMG в GitHub Release...")
+    def create_github_release_with_assets(self, target):
+        """Создание GitHub Release и загрузка DMG одним вызовом gh"""
+        self.log("Создаю GitHub Release с DMG...")
         
         dmg_name = f"MacSSH-{self.new_version}.dmg"
         
         if not os.path.exists(dmg_name):
             self.log(f"DMG файл не найден: {dmg_name}", "ERROR")
-            return
+            sys.exit(1)
+        
+        # Заметки передаем файлом, чтобы не экранировать их в аргументах
+        notes = self.release_notes_text or f"Release {self.new_version} (build {self.new_build})"
+        with tempfile.NamedTemporaryFile("w", suffix=".md", encoding="utf-8", delete=False) as f:
+            f.write(notes)
+            notes_file = f.name
         
-        # Загружаем в созданный релиз
-        self.run_command(f"gh release upload v{self.new_version} {dmg_name}")
+        # SHA-256 уже посчитан для appcast, повторно DMG не читается
+        checksum_name = self.write_dmg_checksum(dmg_name)
         
-        self.log(f"DMG загружен в релиз: {dmg_name}")
+        # Создаем релиз на указанном коммите и сразу прикладываем DMG и его контрольную сумму
+        try:
+            self.run_command(
+                ["gh", "release", "create", f"v{self.new_version}",
+                 "--target", target,
+                 "--title", f"MacSSH {self.new_version}",
+                 "--notes-file", notes_file,
+                 dmg_name, checksum_name]
+            )
+        finally:
+            os.remove(notes_file)
+        
+        self.log(f"GitHub Release v{self.new_version} создан, DMG загружен: {dmg_name}")
     
     def run_full_release(self):
         """Запуск полного процесса релиза"""
@@ -412,6 +531,9 @@ class MacSSHReleaseAutomation:
         self.log("=" * 50)
         
         try:
+            # 0. Проверка утилит: отсутствие любой из них обнаружится до коммита версий
+            self.check_required_tools()
+            
             # 1. Получение текущих версий
             self.get_current_versions()
             
@@ -432,39 +554,53 @@ class MacSSHReleaseAutomation:
                 for line in self.release_notes_text.splitlines():
                     print(f"     - {line}")
             
-            confirm = input("\nПродолжить? (y/N): ").strip().lower()
+            if self.assume_yes:
+                confirm = 'y'
+            else:
+                confirm = input("\nПродолжить? (y/N): ").strip().lower()
             if confirm != 'y':
                 self.log("Отменено пользователем")
                 return
             
             # 3. Обновление версий
             self.log("\n📝 Шаг 1: Обновление версий")
-            self.update_project_pbxproj()
-            self.update_info_plist()
+            self.update_version_files()
             
             # 4. Локальная сборка
             self.log("\n🔨 Шаг 2: Локальная сборка")
             self.local_build()
             
-            # 5. Создание DMG
-            self.log("\n📦 Шаг 3: Создание DMG")
-            dmg_name = self.create_dmg()
+            # 5. Создание DMG и отправка версий параллельно:
+            # упаковка DMG (диск) не зависит от git push (сеть)
+            self.log("\n📦 Шаг 3: Создание DMG и отправка изменений версий")
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                dmg_future = executor.submit(self.create_dmg)
+                push_future = executor.submit(
+                    self.commit_and_push,
+                    ["MacSSH.xcodeproj/project.pbxproj", "MacSSH/Info.plist"],
+                    f"Update version to {self.new_version} for release"
+                )
+                dmg_name = dmg_future.result()
+                push_future.result()
             
-            # 6. Обновление appcast.xml
+            # 6. Обновление appcast.xml (нужен размер готового DMG)
             self.log("\n📝 Шаг 4: Обновление appcast.xml")
             self.update_appcast_xml()
             
-            # 7. Коммит и отправка
-            self.log("\n📤 Шаг 5: Отправка изменений")
-            self.commit_and_push()
-            
-            # 8. Создание GitHub Release
-            self.log("\n🏷️ Шаг 6: Создание GitHub Release")
-            self.create_github_release()
-            
-            # 9. Загрузка DMG
-            self.log("\n📤 Шаг 7: Загрузка DMG в релиз")
-            self.upload_dmg_to_release()
+            # 7. Создание GitHub Release с DMG и отправка appcast.xml параллельно:
+            # обе операции сетевые и не зависят друг от друга.
+            # Тег ставится на уже отправленный коммит версии
+            self.log("\n🏷️ Шаг 5: Создание GitHub Release с DMG и отправка appcast.xml")
+            release_commit = self.get_head_commit()
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                release_future = executor.submit(self.create_github_release_with_assets, release_commit)
+                push_future = executor.submit(
+                    self.commit_and_push,
+                    ["appcast.xml"],
+                    f"Update appcast for {self.new_version}"
+                )
+                release_future.result()
+                push_future.result()
             
             self.log("\n✅ Релиз успешно завершен!")
             self.log(f"🎉 Новая версия {self.new_version} доступна на GitHub")
@@ -478,12 +614,17 @@ class MacSSHReleaseAutomation:
 
 def main():
     """Главная функция"""
-    if len(sys.argv) > 1 and sys.argv[1] == "--help":
+    # Справка выводится до создания объекта релиза
+    if len(sys.argv) > 1 and sys.argv[1] in ("--help", "-h"):
         print("""
 MacSSH Release Automation Script
 
 Использование:
-    python3 release_automation.py
+    python3 release_automation.py [--clean] [--yes]
+
+Опции:
+    --clean    Полная пересборка (xcodebuild clean build) вместо инкрементальной
+    -y, --yes  Не задавать вопросов: заметки из коммитов, релиз без подтверждения
 
 Что делает скрипт:
 1. Обновляет версии во всех файлах (project.pbxproj, Info.plist, appcast.xml)
@@ -502,7 +643,11 @@ MacSSH Release Automation Script
         """)
         return
     
-    automation = MacSSHReleaseAutomation()
+    args = sys.argv[1:]
+    automation = MacSSHReleaseAutomation(
+        clean_build="--clean" in args,
+        assume_yes="--yes" in args or "-y" in args
+    )
     automation.run_full_release()
 
 if __name__ == "__main__":